@@ -1,26 +1,29 @@
 import subprocess as sp
 import tempfile
+from functools import lru_cache
 
 import pandas as pd
 
 from ..types import Language
 
+TYPE_MAP = {"int64": "number", "object": "symbol", "float64": "float"}
+
+
+@lru_cache(maxsize=None)
+def _convert_name(c):
+    try:
+        int(c)
+        return f"x{c}"
+    except ValueError:
+        return c
+
 
 class _Datalog(Language):
     def execute(self, program, task, dataframes, debug=False):
         def columns_to_relation(df):
-            type_map = {"int64": "number", "object": "symbol", "float64": "float"}
-
-            def convert_name(c):
-                try:
-                    int(c)
-                    return f"x{c}"
-                except ValueError:
-                    return c
-
+            dtypes = df.dtypes.astype(str)
             return [
-                f"{convert_name(c)}:{type_map[str(df[c].dtype)]}"
-                for c in sorted(df.columns)
+                f"{_convert_name(c)}:{TYPE_MAP[dtypes[c]]}" for c in sorted(df.columns)
             ]
 
         prelude = []
@@ -46,19 +49,18 @@ class _Datalog(Language):
                 f.write(program)
 
             for table_name, df in dataframes.items():
-                df.to_csv(
-                    f"{path}/{table_name}.facts",
-                    sep="\t",
-                    index=False,
-                    header=False,
-                )
+                with open(f"{path}/{table_name}.facts", "w") as f:
+                    f.writelines(
+                        "\t".join(map(str, row)) + "\n"
+                        for row in df.itertuples(index=False, name=None)
+                    )
 
             try:
-                sp.check_output(
-                    "souffle -F. -D. program.dl",
+                sp.run(
+                    ["souffle", "-F.", "-D.", "program.dl"],
                     cwd=path,
-                    shell=True,
-                    stderr=sp.PIPE,
+                    check=True,
+                    capture_output=True,
                 )
             except sp.CalledProcessError as e:
                 print(e.stderr.decode("utf-8"))
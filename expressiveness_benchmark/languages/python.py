@@ -1,29 +1,39 @@
+from copy import deepcopy
+from functools import lru_cache
+
+import pandas as pd
+
 from ..types import Language
 
+IMPORTS = [
+    "import pandas as pd",
+    "import numpy as np",
+    "from collections import defaultdict",
+    "import math",
+]
+
+
+@lru_cache(maxsize=512)
+def _compile(source):
+    return compile(source, "<string>", "exec")
+
 
 class _Python(Language):
     def execute(self, program, task, dataframes, debug=False):
         globls = {}
-        imports = [
-            "import pandas as pd",
-            "import numpy as np",
-            "from collections import defaultdict",
-            "import math",
-        ]
-
         exec(
-            "\n".join(imports) + "\n" + program.source,
+            _compile("\n".join(IMPORTS) + "\n" + program.source),
             globls,
             globls,
         )
 
-        args = [
-            f"{k}=pd.DataFrame({v})" if "pandas" in self.id else f"{k}={v}"
+        # Copied so that programs which mutate their arguments don't alter the task
+        use_pandas = "pandas" in self.id
+        inputs = {
+            k: pd.DataFrame(v) if use_pandas else deepcopy(v)
             for k, v in task.sample_input.items()
-        ]
-
-        call = f"{task.id}({', '.join(args)})"
-        return eval(call, globls, globls)
+        }
+        return globls[task.id](**inputs)
 
 
 LANGUAGES = [
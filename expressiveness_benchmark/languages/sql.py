@@ -1,35 +1,61 @@
 import sqlite3
 
+import pandas as pd
+
 from ..types import Language
 
+# Same column types DataFrame.to_sql declares, so SQLite's type affinity is unchanged
+SQLITE_TYPE = {
+    "int64": "INTEGER",
+    "float64": "REAL",
+    "bool": "INTEGER",
+    "object": "TEXT",
+    "str": "TEXT",
+    "string": "TEXT",
+    "category": "TEXT",
+    "datetime64[s]": "TIMESTAMP",
+    "datetime64[ms]": "TIMESTAMP",
+    "datetime64[us]": "TIMESTAMP",
+    "datetime64[ns]": "TIMESTAMP",
+}
+
+# sqlite3 only adapts datetime.datetime itself, not pandas' subclass
+sqlite3.register_adapter(pd.Timestamp, lambda ts: ts.isoformat(" "))
+
 
 class _Sql(Language):
     def execute(self, program, task, dataframes, debug=False):
         conn = sqlite3.connect(":memory:")
 
-        # https://stackoverflow.com/questions/3300464/how-can-i-get-dict-from-sqlite-query
-        def dict_factory(cursor, row):
-            d = {}
-            for idx, col in enumerate(cursor.description):
-                d[col[0]] = row[idx]
-            return d
+        try:
+            with conn:
+                for table_name, df in dataframes.items():
+                    columns = ", ".join(
+                        f'"{c}" {SQLITE_TYPE[str(dt)]}'
+                        for c, dt in zip(df.columns, df.dtypes)
+                    )
+                    conn.execute(f'CREATE TABLE "{table_name}"({columns})')
+                    conn.executemany(
+                        f'INSERT INTO "{table_name}" VALUES ({", ".join("?" * len(df.columns))})',
+                        df.itertuples(index=False, name=None),
+                    )
+            commands = [cmd for cmd in program.source.split(";") if cmd.strip()]
+            if len(commands) == 0:
+                return []
 
-        conn.row_factory = dict_factory
+            # Run any setup statements as one script, then the final query on its own
+            if len(commands) > 1:
+                conn.executescript(";".join(commands[:-1]))
+            c = conn.execute(commands[-1])
 
-        try:
-            for table_name, df in dataframes.items():
-                df.to_sql(table_name, con=conn)
-            conn.commit()
-            c = conn.cursor()
-
-            commands = program.source.split(";")
-            for cmd in commands:
-                c.execute(cmd)
-
-            ret = c.fetchall()
-            if len(ret) > 0 and len(ret[0]) == 1:
-                return [r[list(r.keys())[0]] for r in ret]
-            return ret
+            if c.description is None:
+                return []
+
+            columns = [d[0] for d in c.description]
+            rows = c.fetchall()
+            if len(columns) == 1:
+                return [r[0] for r in rows]
+            return pd.DataFrame(rows, columns=columns)
 
         finally:
             conn.close()
@@ -1,7 +1,8 @@
 import json
 import os
-from dataclasses import dataclass, field, replace
-from glob import glob
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List
 import tempfile
@@ -9,14 +10,37 @@ import subprocess as sp
 from iterextras import par_for
 
 import ipywidgets as widgets
+import msgspec
 import numpy as np
 import pandas as pd
-from dataclasses_json import dataclass_json
 from IPython.display import display
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 MAX_LINE_SIZE = 70
 
+_encoder = msgspec.json.Encoder()
+
+
+def _encode(obj):
+    # indent=0 matches the json.dumps separators used by the files in data/.
+    # Unlike json.dumps, non-ASCII text is written as raw UTF-8, not \uXXXX escapes
+    return msgspec.json.format(_encoder.encode(obj), indent=0)
+
+
+@lru_cache(maxsize=None)
+def _decoder(cls):
+    # Building a Decoder compiles the type schema, so do it once per class
+    return msgspec.json.Decoder(cls)
+
+
+def _json_paths(d):
+    for entry in os.scandir(d):
+        if entry.is_dir():
+            yield from _json_paths(entry.path)
+        elif entry.name.endswith(".json"):
+            yield entry.path
+
+
 class Base:
     def validate(self):
         pass
@@ -30,30 +54,40 @@ class Base:
         p = Path(self.path())
         p.parent.mkdir(parents=True, exist_ok=True)
 
-        with p.open("w") as f:
-            f.write(self.to_json())
+        p.write_bytes(_encode(self))
 
     def load(self):
-        return self.from_json(open(self.path(), "r").read())
+        return self.from_json(Path(self.path()).read_bytes())
+
+    def to_json(self):
+        return _encode(self).decode("utf-8")
+
+    @classmethod
+    def from_json(cls, data):
+        return _decoder(cls).decode(data)
 
     @classmethod
     def _load_all(cls):
-        paths = glob(os.path.join(cls.fdir(), "**", "*.json"), recursive=True)
-        return [cls.from_json(open(path).read()) for path in paths]
+        decoder = _decoder(cls)
+
+        def load_one(path):
+            return decoder.decode(Path(path).read_bytes())
+
+        # Loading is dominated by file reads, which release the GIL
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as ex:
+            return list(ex.map(load_one, _json_paths(cls.fdir())))
 
     @classmethod
     def load_all(cls):
         return pd.DataFrame(cls._load_all())
 
 
-@dataclass_json
 @dataclass
 class Plan:
     id: str
     description: str
 
 
-@dataclass_json
 @dataclass
 class Task(Base):
     id: str
@@ -76,7 +110,11 @@ class Task(Base):
         assert self.sample_output is not None
 
 
-@dataclass_json
+@lru_cache(maxsize=None)
+def _load_task(task_id):
+    return Task(id=task_id).load()
+
+
 @dataclass
 class Language(Base):
     id: str
@@ -106,7 +144,6 @@ class Language(Base):
             return int(out)
 
 
-@dataclass_json
 @dataclass
 class SourceRange:
     line: int
@@ -120,7 +157,6 @@ class SourceRange:
             return ''
 
 
-@dataclass_json
 @dataclass
 class Program(Base):
     task: str
@@ -151,7 +187,7 @@ class Program(Base):
             ntokens = lang.ntokens(p.source)
             lines = p.source.split('\n')
             plan_ntokens = {
-                k: [{**json.loads(r.to_json()), 'ntokens': lang.ntokens(r.slice(lines))}
+                k: [{**asdict(r), 'ntokens': lang.ntokens(r.slice(lines))}
                     for r in ranges]
                 for k, ranges in p.plan.items()
             }
@@ -169,7 +205,7 @@ class Program(Base):
 
     def validate(self):
         try:
-            Task(id=self.task).load()
+            _load_task(self.task)
         except FileNotFoundError:
             assert False, f"{self.task} is not a valid task"
         assert self.author != "", "Author must not be empty"
@@ -233,10 +269,35 @@ class Program(Base):
         actual = self.to_dataframe(actual)
 
         try:
-            target = target.sort_values(by=target.columns[0], ignore_index=True)
-            actual = actual.sort_values(by=target.columns[0], ignore_index=True)
+            # DataFrame.equals never holds across differing columns or dtypes
+            if not (
+                target.columns.equals(actual.columns)
+                and target.dtypes.equals(actual.dtypes)
+            ):
+                assert False
+
+            t_key = target.iloc[:, 0].to_numpy()
+            a_key = actual.iloc[:, 0].to_numpy()
+            sortable = pd.api.types.is_numeric_dtype(t_key) and not (
+                pd.isna(t_key).any() or pd.isna(a_key).any()
+            )
+            if not sortable:
+                # Keys that argsort can't order (None, NaN) go through pandas' sort
+                target = target.sort_values(by=target.columns[0], ignore_index=True)
+                actual = actual.sort_values(by=target.columns[0], ignore_index=True)
+
+                if not target.equals(actual):
+                    assert False
+                return
+
+            t = target.to_numpy()
+            a = actual.to_numpy()
+            if t.shape != a.shape:
+                assert False
 
-            if not target.equals(actual):
+            t = t[np.argsort(t_key, kind="stable")]
+            a = a[np.argsort(a_key, kind="stable")]
+            if not ((t == a) | (pd.isna(t) & pd.isna(a))).all():
                 assert False
         except Exception:
             print("Mismatch between target and actual output.")
@@ -247,8 +308,9 @@ class Program(Base):
     def execute(self, task, debug=False):
         dataframes = {}
         for table_name, table in task.sample_input.items():
-            df = pd.DataFrame(table)
-            dataframes[table_name] = df.reindex(sorted(df.columns), axis=1)
+            # Passing the sorted keys as columns= orders them without a reindex copy
+            columns = sorted({k for row in table for k in row})
+            dataframes[table_name] = pd.DataFrame(table, columns=columns)
 
         ret = LANGUAGES[self.language].execute(self, task, dataframes, debug)
 
@@ -4,11 +4,11 @@ from glob import glob
 def collate(d):
     all_data = []
     for path in glob(f'data/{d}/**/*.json', recursive=True):
-        with open(path) as f:
+        with open(path, encoding='utf-8') as f:
             data = json.load(f)
             all_data.append(data)
 
-    with open(f'data/{d}.json', 'w') as f:
+    with open(f'data/{d}.json', 'w', encoding='utf-8') as f:
         f.write(json.dumps(all_data))
 
 for d in ['programs', 'tasks', 'languages']: